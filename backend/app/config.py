@@ -1,8 +1,14 @@
 """Application configuration using Pydantic Settings."""
 
+import base64
+import binascii
+import hashlib
+from functools import cached_property, lru_cache
+import httpx
+from cryptography.fernet import Fernet
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import List
+from typing import Dict, Tuple
 
 
 class Settings(BaseSettings):
@@ -12,7 +18,9 @@ class Settings(BaseSettings):
     LASERFICHE_CLIENT_ID: str
     LASERFICHE_CLIENT_SECRET: str
     LASERFICHE_REDIRECT_URI: str
-    LASERFICHE_PROJECT_NAME: str = "Global"  # Your Laserfiche project name (use + for spaces)
+    LASERFICHE_PROJECT_NAME: str = (
+        "Global"  # Your Laserfiche project name (use + for spaces)
+    )
 
     # Security
     SECRET_KEY: str  # Used for signing OAuth state cookies
@@ -24,27 +32,75 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     FRONTEND_URL: str = "http://localhost:3000"  # Where to redirect after OAuth
 
+    # Laserfiche API connection pool
+    LASERFICHE_MAX_CONNECTIONS: int = 1000
+    LASERFICHE_MAX_KEEPALIVE: int = 100
+    LASERFICHE_MAX_CONCURRENCY: int = 32  # In-flight request cap per worker
+    LASERFICHE_RATE_LIMIT_RPS: float = (
+        0  # Request starts per second per worker (0 = unpaced)
+    )
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
-    @field_validator('TOKEN_ENCRYPTION_KEY')
+    @field_validator("TOKEN_ENCRYPTION_KEY")
     @classmethod
     def validate_encryption_key(cls, v: str) -> str:
-        """Validate that TOKEN_ENCRYPTION_KEY is a valid Fernet key."""
-        from cryptography.fernet import Fernet
+        """Validate that TOKEN_ENCRYPTION_KEY is a valid Fernet key.
+
+        A Fernet key is 32 bytes, url-safe base64 encoded. Checking the
+        decoded length directly avoids building a throwaway cipher; the real
+        one is created once by ``token_cipher``.
+        """
         try:
-            Fernet(v.encode())
-        except Exception:
+            valid = len(base64.urlsafe_b64decode(v.encode())) == 32
+        except (binascii.Error, ValueError):
+            valid = False
+        if not valid:
             raise ValueError(
                 "TOKEN_ENCRYPTION_KEY must be a valid Fernet key. "
-                "Generate one with: python -c \"from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())\""
+                'Generate one with: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"'
             )
         return v
 
-    @property
-    def allowed_origins_list(self) -> List[str]:
-        """Parse ALLOWED_ORIGINS into a list."""
-        return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+    @cached_property
+    def token_cipher(self) -> Fernet:
+        """Fernet cipher for TOKEN_ENCRYPTION_KEY (built once per instance)."""
+        return Fernet(self.TOKEN_ENCRYPTION_KEY.encode())
+
+    @cached_property
+    def state_mac(self) -> "hashlib.blake2b":
+        """Keyed BLAKE2b (16-byte digest) for signing state; ``.copy()`` it per message.
+
+        SECRET_KEY is hashed to 64 bytes first, since BLAKE2b keys are capped
+        at that length.
+        """
+        key = hashlib.blake2b(self.SECRET_KEY.encode()).digest()
+        return hashlib.blake2b(key=key, digest_size=16)
+
+    @cached_property
+    def allowed_origins_list(self) -> Tuple[str, ...]:
+        """Parse ALLOWED_ORIGINS into a tuple (computed once per instance)."""
+        return tuple(origin.strip() for origin in self.ALLOWED_ORIGINS.split(","))
+
+
+# Per-operation timeouts for Laserfiche API calls. Metadata lookups fail fast
+# so hung requests release pool slots; row reads get more room.
+HTTP_TIMEOUTS: Dict[str, httpx.Timeout] = {
+    "oauth_token": httpx.Timeout(10.0, connect=3.0),
+    "list_tables": httpx.Timeout(5.0, connect=3.0),
+    "get_table_schema": httpx.Timeout(10.0, connect=3.0),
+    "get_table_rows": httpx.Timeout(15.0, connect=3.0),
+    "get_table_row": httpx.Timeout(10.0, connect=3.0),
+    "get_table_row_count": httpx.Timeout(15.0, connect=3.0),
+    "get_repositories": httpx.Timeout(5.0, connect=3.0),
+}
+
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings instance.
 
-# Global settings instance
-settings = Settings()
+    The environment and .env file are parsed once on first call; use as a
+    FastAPI dependency (``Depends(get_settings)``) so tests can override it.
+    """
+    return Settings()
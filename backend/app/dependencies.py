@@ -1,17 +1,72 @@
 """FastAPI dependencies for authentication."""
 
-from fastapi import Cookie, HTTPException
-from typing import Optional
+import hashlib
+import re
+from cachetools import TTLCache
+from fastapi import Cookie, HTTPException, Request
+from typing import Optional, cast
 
 from app.utils.security import decrypt_token
 
+# Short-lived cache of decrypted tokens, keyed by a digest of the cookie
+# (never the raw cookie) so repeat requests skip the Fernet decrypt.
+TOKEN_CACHE_TTL = 30  # seconds
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL)
+
+# Fernet tokens are url-safe base64 of a 0x80 version byte, timestamp, IV,
+# ciphertext and HMAC (at least 73 bytes -> 100 chars), so they always start
+# with "gAAAAA". Cookies that can't be Fernet tokens are rejected up front.
+_FERNET_TOKEN_RE = re.compile(r"gAAAAA[A-Za-z0-9_\-]+={0,2}")
+_FERNET_TOKEN_MIN_LEN = 100
+
+
+def _decrypt_cached(lf_token: str) -> str:
+    """Decrypt a token cookie, reusing a recent result if available.
+
+    Raises:
+        Exception: If the token cannot be decrypted
+    """
+    if len(lf_token) < _FERNET_TOKEN_MIN_LEN or not _FERNET_TOKEN_RE.fullmatch(
+        lf_token
+    ):
+        raise ValueError("Malformed token cookie")
+
+    cache_key = hashlib.blake2b(lf_token.encode(), digest_size=16).digest()
+    access_token = _token_cache.get(cache_key)
+    if access_token is None:
+        access_token = decrypt_token(lf_token)
+        _token_cache[cache_key] = access_token
+    return access_token
+
+
+def _resolve_access_token(request: Request, lf_token: str) -> Optional[str]:
+    """Decrypt the token cookie at most once per request.
+
+    The result (or None if the cookie is invalid) is stored on
+    ``request.state`` so every auth dependency in the request shares it;
+    ``lf_token_resolved`` marks it as set, since None is a valid result.
+    """
+    if getattr(request.state, "lf_token_resolved", False):
+        return cast(Optional[str], request.state.lf_access_token)
+
+    try:
+        access_token: Optional[str] = _decrypt_cached(lf_token)
+    except Exception:
+        access_token = None
+
+    request.state.lf_access_token = access_token
+    request.state.lf_token_resolved = True
+    return access_token
+
 
 async def get_user_access_token(
+    request: Request,
     lf_token: Optional[str] = Cookie(None),
 ) -> str:
     """Get decrypted access token from cookie.
 
     Args:
+        request: Current request (decrypted token is cached on its state)
         lf_token: Encrypted access token from cookie
 
     Returns:
@@ -26,21 +81,23 @@ async def get_user_access_token(
             detail="Not authenticated. Please log in.",
         )
 
-    try:
-        return decrypt_token(lf_token)
-    except Exception:
+    access_token = _resolve_access_token(request, lf_token)
+    if access_token is None:
         raise HTTPException(
             status_code=401,
             detail="Invalid or expired token. Please log in again.",
         )
+    return access_token
 
 
 async def get_user_access_token_optional(
+    request: Request,
     lf_token: Optional[str] = Cookie(None),
 ) -> Optional[str]:
     """Optional authentication - returns token or None.
 
     Args:
+        request: Current request (decrypted token is cached on its state)
         lf_token: Encrypted access token from cookie
 
     Returns:
@@ -49,7 +106,4 @@ async def get_user_access_token_optional(
     if not lf_token:
         return None
 
-    try:
-        return decrypt_token(lf_token)
-    except Exception:
-        return None
+    return _resolve_access_token(request, lf_token)
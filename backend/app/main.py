@@ -1,39 +1,27 @@
 """FastAPI application entry point."""
 
-from fastapi import FastAPI
+import gzip
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from app.config import settings
-
-# Create FastAPI app
-app = FastAPI(
-    title="Laserfiche Data View API",
-    description="API for viewing and managing Laserfiche lookup table data",
-    version="1.0.0",
-    docs_url="/docs" if settings.DEBUG else None,
-    redoc_url="/redoc" if settings.DEBUG else None,
-)
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
+from app.config import Settings, get_settings
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.allowed_origins_list,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Top-level endpoints (registered on the app in create_app)
+router = APIRouter()
 
 
 # Health check endpoint
-@app.get("/health")
-async def health_check():
+@router.get("/health")
+async def health_check(settings: Settings = Depends(get_settings)):
     """Health check endpoint for Docker."""
     return {"status": "healthy", "environment": settings.ENVIRONMENT}
 
 
 # Root endpoint
-@app.get("/")
-async def root():
+@router.get("/")
+async def root(settings: Settings = Depends(get_settings)):
     """Root endpoint."""
     return {
         "message": "Laserfiche Data View API",
@@ -42,18 +30,8 @@ async def root():
     }
 
 
-# Include routers
-from app.routers import auth, tables
-
-app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-app.include_router(tables.router, prefix="/tables", tags=["Tables"])
-
-
-# Test page endpoint
-@app.get("/test", response_class=HTMLResponse)
-async def test_page():
-    """Serve OAuth test page."""
-    html_content = """
+# OAuth test page, encoded once at import
+_TEST_PAGE_BYTES: bytes = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -242,5 +220,72 @@ async def test_page():
         </script>
     </body>
     </html>
+""".encode(
+    "utf-8"
+)
+_TEST_PAGE_GZIP: bytes = gzip.compress(_TEST_PAGE_BYTES, compresslevel=9)
+
+
+# Test page endpoint
+@router.get("/test", response_class=HTMLResponse)
+async def test_page(request: Request):
+    """Serve OAuth test page (pre-compressed when the client accepts gzip)."""
+    headers = {"Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=_TEST_PAGE_GZIP, media_type="text/html", headers=headers
+        )
+    return Response(content=_TEST_PAGE_BYTES, media_type="text/html", headers=headers)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: warm the shared Laserfiche HTTP client on startup
+    and release it on shutdown."""
+    from app.utils.laserfiche import laserfiche_client
+
+    await laserfiche_client.warmup()
+    yield
+    await laserfiche_client.aclose()
+
+
+def create_app() -> FastAPI:
+    """Build the FastAPI application.
+
+    Routers are imported here rather than at module scope so their
+    dependencies (cryptography, httpx, schemas) load only when an app is
+    actually created.
     """
-    return HTMLResponse(content=html_content)
+    from app.routers import auth, tables
+
+    settings = get_settings()
+
+    app = FastAPI(
+        title="Laserfiche Data View API",
+        description="API for viewing and managing Laserfiche lookup table data",
+        version="1.0.0",
+        docs_url="/docs" if settings.DEBUG else None,
+        redoc_url="/redoc" if settings.DEBUG else None,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.allowed_origins_list,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include routers
+    app.include_router(router)
+    app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
+    app.include_router(tables.router, prefix="/tables", tags=["Tables"])
+
+    return app
+
+
+app = create_app()
@@ -8,7 +8,7 @@ import logging
 from app.services import auth_service
 from app.dependencies import get_user_access_token, get_user_access_token_optional
 from app.utils.security import encrypt_token
-from app.config import settings
+from app.config import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ STATE_COOKIE_MAX_AGE = 600   # 10 minutes (for OAuth flow)
 
 
 @router.get("/login")
-async def login(response: Response):
+async def login(response: Response, settings: Settings = Depends(get_settings)):
     """Initiate OAuth flow.
 
     Sets a signed state cookie and returns redirect URL.
@@ -37,7 +37,7 @@ async def login(response: Response):
         f"project/{settings.LASERFICHE_PROJECT_NAME}",
     ]
 
-    logger.info(f"Initiating OAuth with scopes: {scopes}")
+    logger.info("Initiating OAuth with scopes: %s", scopes)
     result = auth_service.initiate_oauth_flow(scopes)
 
     # Set signed state in cookie for CSRF protection
@@ -60,6 +60,7 @@ async def callback(
     state: str,
     request: Request,
     lf_state: Optional[str] = Cookie(None),
+    settings: Settings = Depends(get_settings),
 ):
     """Handle OAuth callback from Laserfiche.
 
@@ -84,7 +85,7 @@ async def callback(
 
     # Exchange code for token
     token_response = await auth_service.exchange_code_for_token(code)
-    logger.info(f"Token response keys: {token_response.keys()}")
+    logger.info("Token response keys: %s", token_response.keys())
 
     # Get token expiry (default 1 hour)
     expires_in = token_response.get("expires_in", 3600)
@@ -1,12 +1,16 @@
 """API endpoints for table CRUD operations."""
 
-from typing import Any, Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-import json
-import httpx
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+from httpx import HTTPStatusError
+import functools
+import logging
+import orjson
 
 from app.dependencies import get_user_access_token
-from app.config import settings
+from app.config import get_settings
 from app.schemas.table import (
     TableListResponse,
     TableRowsResponse,
@@ -16,21 +20,25 @@ from app.schemas.table import (
     TableSchemaResponse,
     ColumnInfo,
     TableCountResponse,
+    TableViewResponse,
 )
 from app.utils.laserfiche import laserfiche_client
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
 # Debug endpoint - only available when DEBUG=True
-if settings.DEBUG:
+if get_settings().DEBUG:
     @router.get(
         "/debug",
         summary="Debug table API (DEV ONLY)",
         description="Debug endpoint - DISABLED IN PRODUCTION",
-        include_in_schema=settings.DEBUG,
+        include_in_schema=True,
     )
     async def debug_tables(
+        background_tasks: BackgroundTasks,
         access_token: str = Depends(get_user_access_token),
     ):
         """Debug endpoint to test Laserfiche Table API.
@@ -38,9 +46,6 @@ if settings.DEBUG:
         WARNING: Only available in development mode.
         Does NOT expose access tokens.
         """
-        import logging
-        logger = logging.getLogger(__name__)
-
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Accept": "application/json",
@@ -49,20 +54,21 @@ if settings.DEBUG:
         url = "https://api.laserfiche.com/odata4/table"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers)
-
-                logger.info(f"Debug - URL: {url}")
-                logger.info(f"Debug - Status: {response.status_code}")
-                logger.info(f"Debug - Response: {response.text[:500]}")
-
-                return {
-                    "url": url,
-                    "status_code": response.status_code,
-                    "response_headers": dict(response.headers),
-                    "response_body": response.json() if response.status_code == 200 else response.text,
-                    # SECURITY: Never expose access tokens, even in debug mode
-                }
+            # Reuse the shared, lifespan-managed client (pooled keep-alive)
+            response = await laserfiche_client.client.get(url, headers=headers)
+
+            # Log after the response is sent
+            background_tasks.add_task(logger.info, "Debug - URL: %s", url)
+            background_tasks.add_task(logger.info, "Debug - Status: %s", response.status_code)
+            background_tasks.add_task(logger.info, "Debug - Response: %.500s", response.text)
+
+            return {
+                "url": url,
+                "status_code": response.status_code,
+                "response_headers": dict(response.headers),
+                "response_body": orjson.loads(response.content) if response.status_code == 200 else response.text,
+                # SECURITY: Never expose access tokens, even in debug mode
+            }
         except Exception as e:
             return {
                 "url": url,
@@ -70,7 +76,41 @@ if settings.DEBUG:
             }
 
 
-def handle_laserfiche_error(e: httpx.HTTPStatusError) -> HTTPException:
+# Laserfiche status codes mapped to user-facing messages
+_STATIC_ERROR_MESSAGES: Dict[int, str] = {
+    401: "Authentication failed. Please log in again.",
+    403: "Insufficient permissions. Check your OAuth scopes.",
+    500: "Laserfiche API error. Please try again later.",
+}
+# Messages that include the upstream error detail
+_DETAIL_ERROR_MESSAGES: Dict[int, str] = {
+    400: "Bad request: {}",
+    404: "Resource not found: {}",
+    409: "Conflict: {}",
+}
+
+
+def _extract_error_detail(e: HTTPStatusError) -> str:
+    """Extract the error message from a Laserfiche JSON error body.
+
+    Non-JSON and empty bodies are not parsed at all.
+
+    Args:
+        e: HTTP error from Laserfiche API
+
+    Returns:
+        error.message from the body, or str(e) if unavailable
+    """
+    response = e.response
+    if response.content and "json" in response.headers.get("content-type", ""):
+        try:
+            return orjson.loads(response.content).get("error", {}).get("message", str(e))
+        except Exception:
+            pass
+    return str(e)
+
+
+def handle_laserfiche_error(e: HTTPStatusError) -> HTTPException:
     """Transform Laserfiche API errors to FastAPI HTTPExceptions.
 
     Args:
@@ -81,26 +121,93 @@ def handle_laserfiche_error(e: httpx.HTTPStatusError) -> HTTPException:
     """
     status_code = e.response.status_code
 
-    # Try to extract error message from response
-    try:
-        error_data = e.response.json()
-        detail = error_data.get("error", {}).get("message", str(e))
-    except Exception:
-        detail = str(e)
+    # Map common error codes; only parse the body when the message needs it
+    message = _STATIC_ERROR_MESSAGES.get(status_code)
+    if message is None:
+        detail = _extract_error_detail(e)
+        template = _DETAIL_ERROR_MESSAGES.get(status_code)
+        message = template.format(detail) if template else detail
 
-    # Map common error codes
-    error_messages = {
-        400: f"Bad request: {detail}",
-        401: "Authentication failed. Please log in again.",
-        403: "Insufficient permissions. Check your OAuth scopes.",
-        404: f"Resource not found: {detail}",
-        409: f"Conflict: {detail}",
-        500: "Laserfiche API error. Please try again later.",
-    }
+    return HTTPException(status_code=status_code, detail=message)
 
-    message = error_messages.get(status_code, detail)
 
-    raise HTTPException(status_code=status_code, detail=message)
+def _parse_row_query(
+    filters: Optional[str], filter_mode: str, columns: Optional[str]
+) -> Tuple[Optional[Dict[str, str]], Optional[List[str]]]:
+    """Validate and parse the row-listing query parameters.
+
+    Args:
+        filters: JSON-encoded filter object, if any
+        filter_mode: "and" or "or"
+        columns: Comma-separated column names, if any
+
+    Returns:
+        Tuple of (filter dict or None, column list or None)
+
+    Raises:
+        HTTPException: 400 if filters is not valid JSON or filter_mode is unknown
+    """
+    # Parse filters JSON if provided
+    filter_dict: Optional[Dict[str, str]] = None
+    if filters:
+        try:
+            filter_dict = orjson.loads(filters)
+        except orjson.JSONDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid filters format. Must be valid JSON.",
+            )
+
+    # Validate filter_mode
+    if filter_mode not in ("and", "or"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="filter_mode must be 'and' or 'or'.",
+        )
+
+    column_list = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    return filter_dict, column_list
+
+
+_T = TypeVar("_T")
+
+
+def handle_laserfiche_errors(
+    action: str,
+) -> Callable[[Callable[..., Awaitable[_T]]], Callable[..., Awaitable[_T]]]:
+    """Wrap an endpoint with the shared Laserfiche error handling.
+
+    HTTPExceptions raised by the endpoint pass through unchanged, upstream
+    HTTP errors are mapped by handle_laserfiche_error, and anything else
+    becomes a 500 "Failed to <action>" response.
+
+    Args:
+        action: Description used in the 500 message (e.g. "list tables")
+
+    Returns:
+        Decorator preserving the endpoint signature for FastAPI
+    """
+
+    def decorator(fn: Callable[..., Awaitable[_T]]) -> Callable[..., Awaitable[_T]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> _T:
+            try:
+                return await fn(*args, **kwargs)
+            except HTTPException:
+                raise
+            except HTTPStatusError as e:
+                logger.error("Laserfiche API error: %s - %s", e.response.status_code, e.response.text)
+                raise handle_laserfiche_error(e) from e
+            except Exception as e:
+                logger.error("Failed to %s: %s: %s", action, type(e).__name__, e, exc_info=True)
+                raise HTTPException(
+                    status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to {action}: {str(e)}",
+                )
+
+        return wrapper
+
+    return decorator
 
 
 @router.get(
@@ -109,7 +216,9 @@ def handle_laserfiche_error(e: httpx.HTTPStatusError) -> HTTPException:
     summary="List all tables",
     description="Get a list of all accessible Laserfiche lookup tables",
 )
+@handle_laserfiche_errors("list tables")
 async def list_tables(
+    background_tasks: BackgroundTasks,
     access_token: str = Depends(get_user_access_token),
 ) -> TableListResponse:
     """List all accessible tables.
@@ -119,39 +228,27 @@ async def list_tables(
     Returns:
         List of table information
     """
-    try:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"Attempting to list tables with token: {access_token[:20]}...")
-
-        tables_data = await laserfiche_client.list_tables(access_token)
-        logger.info(f"Received {len(tables_data)} tables from Laserfiche")
-
-        # Transform to our schema
-        tables = [
-            TableInfo(
-                name=table.get("name", ""),
-                displayName=table.get("displayName"),
-                description=table.get("description"),
-            )
-            for table in tables_data
-        ]
-
-        return TableListResponse(tables=tables)
-
-    except httpx.HTTPStatusError as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Laserfiche API error: {e.response.status_code} - {e.response.text}")
-        handle_laserfiche_error(e)
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Unexpected error listing tables: {type(e).__name__}: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to list tables: {str(e)}",
+    # Informational logging runs after the response is sent
+    background_tasks.add_task(
+        logger.info, "Attempting to list tables with token: %.20s...", access_token
+    )
+
+    tables_data = await laserfiche_client.list_tables(access_token)
+    background_tasks.add_task(
+        logger.info, "Received %d tables from Laserfiche", len(tables_data)
+    )
+
+    # Transform to our schema
+    tables = [
+        TableInfo(
+            name=table.get("name", ""),
+            displayName=table.get("displayName"),
+            description=table.get("description"),
         )
+        for table in tables_data
+    ]
+
+    return TableListResponse(tables=tables)
 
 
 @router.get(
@@ -160,14 +257,18 @@ async def list_tables(
     summary="Get table rows",
     description="Get rows from a table with pagination and filtering support",
 )
+@handle_laserfiche_errors("get table rows")
 async def get_table_rows(
     table_name: str,
     limit: int = Query(50, ge=1, le=1000, description="Number of rows per page"),
     offset: int = Query(0, ge=0, description="Number of rows to skip"),
     filters: Optional[str] = Query(None, description="JSON-encoded filter object {column: value}"),
     filter_mode: str = Query("and", description="Filter logic: 'and' (all must match) or 'or' (any must match)"),
+    case_sensitive: bool = Query(False, description="Match filter values exactly, including case (faster server-side)"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to return (default: all)"),
+    after_key: Optional[str] = Query(None, description="Return rows after this _key (keyset pagination; overrides offset)"),
     access_token: str = Depends(get_user_access_token),
-) -> TableRowsResponse:
+) -> ORJSONResponse:
     """Get rows from a table with pagination and filtering.
 
     Args:
@@ -176,48 +277,33 @@ async def get_table_rows(
         offset: Number of rows to skip
         filters: JSON-encoded filter object (e.g., {"Name": "test", "Status": "Active"})
         filter_mode: Filter logic - "and" (all must match) or "or" (any must match)
+        case_sensitive: Match filter values case-sensitively instead of via toupper()
+        columns: Comma-separated column names to return (e.g., "Name,Status")
+        after_key: _key of the last row already seen (from next_after_key);
+            seeks instead of skipping, so deep pages stay fast
         access_token: User's access token (from dependency)
 
     Returns:
         Paginated rows with metadata
     """
-    # Parse filters JSON if provided
-    filter_dict: Optional[Dict[str, str]] = None
-    if filters:
-        try:
-            filter_dict = json.loads(filters)
-        except json.JSONDecodeError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid filters format. Must be valid JSON.",
-            )
-
-    # Validate filter_mode
-    if filter_mode not in ("and", "or"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="filter_mode must be 'and' or 'or'.",
-        )
-
-    try:
-        data = await laserfiche_client.get_table_rows(
-            access_token=access_token,
-            table_name=table_name,
-            limit=limit,
-            offset=offset,
-            filters=filter_dict,
-            filter_mode=filter_mode,
-        )
-
-        return TableRowsResponse(**data)
+    filter_dict, column_list = _parse_row_query(filters, filter_mode, columns)
+
+    data = await laserfiche_client.get_table_rows(
+        access_token=access_token,
+        table_name=table_name,
+        limit=limit,
+        offset=offset,
+        filters=filter_dict,
+        filter_mode=filter_mode,
+        case_insensitive=not case_sensitive,
+        columns=column_list,
+        after_key=after_key,
+    )
 
-    except httpx.HTTPStatusError as e:
-        handle_laserfiche_error(e)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get table rows: {str(e)}",
-        )
+    # Upstream data is already parsed and shaped like TableRowsResponse;
+    # serialize it directly with orjson, bypassing response_model
+    # validation of every row (response_model still documents the shape).
+    return ORJSONResponse(content=data)
 
 
 @router.get(
@@ -226,6 +312,7 @@ async def get_table_rows(
     summary="Get table schema",
     description="Get the column definitions for a table",
 )
+@handle_laserfiche_errors("get table schema")
 async def get_table_schema(
     table_name: str,
     access_token: str = Depends(get_user_access_token),
@@ -239,30 +326,21 @@ async def get_table_schema(
     Returns:
         Table schema with column definitions
     """
-    try:
-        columns_data = await laserfiche_client.get_table_schema(
-            access_token=access_token,
-            table_name=table_name,
-        )
-
-        columns = [
-            ColumnInfo(
-                name=col["name"],
-                type=col["type"],
-                required=col.get("required", False),
-            )
-            for col in columns_data
-        ]
-
-        return TableSchemaResponse(table_name=table_name, columns=columns)
+    columns_data = await laserfiche_client.get_table_schema(
+        access_token=access_token,
+        table_name=table_name,
+    )
 
-    except httpx.HTTPStatusError as e:
-        handle_laserfiche_error(e)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get table schema: {str(e)}",
+    columns = [
+        ColumnInfo(
+            name=col["name"],
+            type=col["type"],
+            required=col.get("required", False),
         )
+        for col in columns_data
+    ]
+
+    return TableSchemaResponse(table_name=table_name, columns=columns)
 
 
 @router.get(
@@ -271,6 +349,7 @@ async def get_table_schema(
     summary="Get table row count",
     description="Get the number of rows in a table",
 )
+@handle_laserfiche_errors("get table row count")
 async def get_table_row_count(
     table_name: str,
     access_token: str = Depends(get_user_access_token),
@@ -284,21 +363,56 @@ async def get_table_row_count(
     Returns:
         Table name and row count
     """
-    try:
-        row_count = await laserfiche_client.get_table_row_count(
-            access_token=access_token,
-            table_name=table_name,
-        )
+    row_count = await laserfiche_client.get_table_row_count(
+        access_token=access_token,
+        table_name=table_name,
+    )
 
-        return TableCountResponse(table_name=table_name, row_count=row_count)
+    return TableCountResponse(table_name=table_name, row_count=row_count)
 
-    except httpx.HTTPStatusError as e:
-        handle_laserfiche_error(e)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get table row count: {str(e)}",
-        )
+
+@router.get(
+    "/{table_name}/view",
+    response_model=TableViewResponse,
+    summary="Get table view",
+    description="Get the first page of rows, the schema and the row count in one call",
+)
+@handle_laserfiche_errors("get table view")
+async def get_table_view(
+    table_name: str,
+    limit: int = Query(50, ge=1, le=1000, description="Number of rows per page"),
+    offset: int = Query(0, ge=0, description="Number of rows to skip"),
+    filters: Optional[str] = Query(None, description="JSON-encoded filter object {column: value}"),
+    filter_mode: str = Query("and", description="Filter logic: 'and' (all must match) or 'or' (any must match)"),
+    case_sensitive: bool = Query(False, description="Match filter values exactly, including case (faster server-side)"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to return (default: all)"),
+    after_key: Optional[str] = Query(None, description="Return rows after this _key (keyset pagination; overrides offset)"),
+    access_token: str = Depends(get_user_access_token),
+) -> ORJSONResponse:
+    """Get rows, schema and row count for a table concurrently.
+
+    Takes the same parameters as get_table_rows. Schema and count are
+    null if their upstream request fails; the rows request must succeed.
+
+    Returns:
+        Rows page with schema and row count
+    """
+    filter_dict, column_list = _parse_row_query(filters, filter_mode, columns)
+
+    data = await laserfiche_client.get_table_view(
+        access_token=access_token,
+        table_name=table_name,
+        limit=limit,
+        offset=offset,
+        filters=filter_dict,
+        filter_mode=filter_mode,
+        case_insensitive=not case_sensitive,
+        columns=column_list,
+        after_key=after_key,
+    )
+
+    # Already shaped like TableViewResponse; serialize directly (see get_table_rows)
+    return ORJSONResponse(content=data)
 
 
 @router.get(
@@ -307,6 +421,7 @@ async def get_table_row_count(
     summary="Get single row",
     description="Get a single row from a table by its primary key",
 )
+@handle_laserfiche_errors("get table row")
 async def get_table_row(
     table_name: str,
     key: str,
@@ -322,21 +437,12 @@ async def get_table_row(
     Returns:
         Row data
     """
-    try:
-        data = await laserfiche_client.get_table_row(
-            access_token=access_token,
-            table_name=table_name,
-            key=key,
-        )
-
-        return RowResponse(data=data)
+    data = await laserfiche_client.get_table_row(
+        access_token=access_token,
+        table_name=table_name,
+        key=key,
+    )
 
-    except httpx.HTTPStatusError as e:
-        handle_laserfiche_error(e)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to get table row: {str(e)}",
-        )
+    return RowResponse.model_construct(data=data)
 
 
@@ -25,6 +25,9 @@ class TableRowsResponse(BaseModel):
     total: int = Field(..., description="Total number of rows in table (-1 if unknown)", ge=-1)
     limit: int = Field(..., description="Number of rows per page", ge=1, le=1000)
     offset: int = Field(..., description="Number of rows skipped", ge=0)
+    next_after_key: Optional[str] = Field(
+        None, description="Pass as after_key to fetch the next page (null on the last page)"
+    )
 
 
 class RowResponse(BaseModel):
@@ -68,3 +71,12 @@ class TableCountResponse(BaseModel):
 
     table_name: str = Field(..., description="Name of the table")
     row_count: int = Field(..., description="Number of rows in the table")
+
+
+class TableViewResponse(BaseModel):
+    """Response for opening a table: first page of rows plus schema and count."""
+
+    table_name: str = Field(..., description="Name of the table")
+    rows: TableRowsResponse = Field(..., description="Paginated rows")
+    columns: Optional[List[ColumnInfo]] = Field(None, description="Column definitions (null if unavailable)")
+    row_count: Optional[int] = Field(None, description="Number of rows in the table (null if unavailable)")
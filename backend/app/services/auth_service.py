@@ -1,5 +1,6 @@
 """Authentication service for OAuth flow (stateless, cookie-based)."""
 
+import hmac
 from typing import Dict, List
 from fastapi import HTTPException
 
@@ -57,7 +58,8 @@ def validate_state(state_from_callback: str, signed_state_from_cookie: str) -> b
             detail=f"Invalid or expired state. Please try logging in again. ({str(e)})",
         )
 
-    if state_from_callback != original_state:
+    # Constant-time comparison so the check does not leak matching prefixes
+    if not hmac.compare_digest(state_from_callback.encode(), original_state.encode()):
         raise HTTPException(
             status_code=400,
             detail="State mismatch. Possible CSRF attack. Please try logging in again.",
@@ -1,9 +1,142 @@
 """Laserfiche API client for OAuth and OData operations."""
 
+import asyncio
 import base64
+import hashlib
+import random
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from functools import cached_property, lru_cache
 import httpx
-from typing import Dict, List, Optional
-from app.config import settings
+import orjson
+from cachetools import TTLCache
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+from app.config import HTTP_TIMEOUTS, get_settings
+
+try:
+    # C-accelerated streaming XML parsing for large $metadata documents
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover - falls back to xml.etree
+    lxml_etree = None
+
+# OData metadata namespaces
+ODATA_NS = {
+    "edmx": "http://docs.oasis-open.org/odata/ns/edmx",
+    "edm": "http://docs.oasis-open.org/odata/ns/edm",
+}
+
+# Responses that signal Laserfiche is overloaded or throttling us
+THROTTLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+# Transient responses worth retrying on idempotent requests
+RETRY_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted by AIMD from Laserfiche's responses.
+
+    Each successful response raises the limit by 1/limit (about +1 per
+    window of requests); a throttling response (429/5xx) or transport error
+    halves it, at most once per window: failures from requests started
+    before the last decrease are already accounted for. Cancellations and
+    other errors free the slot without adapting. A Retry-After header
+    pauses all new requests until it elapses (at most max_pause seconds),
+    acting as a simple circuit breaker.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, max_pause: float = 8.0) -> None:
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.max_pause = max_pause
+        self.limit = float(max_limit)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """Wait for any Retry-After pause to elapse, then for a free slot.
+
+        Returns:
+            Start time (monotonic) to pass back to release()
+        """
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with self._cond:
+            while self._in_flight >= int(self.limit):
+                await self._cond.wait()
+            self._in_flight += 1
+        return time.monotonic()
+
+    async def release(
+        self,
+        started_at: float,
+        response: Optional[httpx.Response] = None,
+        transport_error: bool = False,
+    ) -> None:
+        """Free a slot and adapt the limit to the outcome.
+
+        Args:
+            started_at: Value returned by acquire() for the request's first
+                attempt, so retries of one request decrease the limit at most once
+            response: Response received, or None if the request did not complete
+            transport_error: The request failed with httpx.TransportError
+        """
+        async with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if transport_error or (
+                response is not None and response.status_code in THROTTLE_STATUS_CODES
+            ):
+                if started_at > self._last_decrease:
+                    self.limit = max(float(self.min_limit), self.limit / 2)
+                    self._last_decrease = now
+                pause = retry_after_seconds(response) if response is not None else None
+                if pause:
+                    pause = min(pause, self.max_pause)
+                    self._paused_until = max(self._paused_until, now + pause)
+            elif response is not None:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class RequestPacer:
+    """Leaky-bucket pacing: spaces request starts at least 1/rate seconds apart.
+
+    A concurrency limit bounds how many requests are in flight, not how many
+    start per second; with short calls a handful of slots can still exceed a
+    per-second quota. Each caller reserves the next send time before
+    sleeping, so concurrent callers queue up in order without a lock.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate
+        self._next_send_at = 0.0
+
+    async def wait(self) -> None:
+        """Sleep until this caller's reserved send time."""
+        now = time.monotonic()
+        send_at = max(now, self._next_send_at)
+        self._next_send_at = send_at + self.interval
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
 
 
 class LaserficheClient:
@@ -13,6 +146,335 @@ class LaserficheClient:
     API_BASE_V2 = "https://api.laserfiche.com/repository/v2"
     API_BASE = "https://api.laserfiche.com/odata4"  # Legacy, may not be used
 
+    # Seconds a cached metadata response (table list, $metadata) is served
+    # without revalidating against Laserfiche
+    METADATA_CACHE_TTL = 60
+    # $metadata (table schemas) changes only on deliberate admin edits
+    SCHEMA_CACHE_TTL = 300
+    # Seconds any cached entry, fresh or stale, is kept at all: a Laserfiche
+    # access token lives an hour, so older entries belong to dead tokens
+    CACHE_RETENTION = 3600
+
+    # Largest page Laserfiche returns (see docs/_api/laserfiche_official_api.md)
+    MAX_PAGE_SIZE = 1000
+
+    # Seconds a row lookup that returned 404 is answered from memory
+    MISSING_ROW_TTL = 30
+
+    # Attempts per idempotent request, with jittered exponential backoff
+    # between them (0.5 s up to 8 s, or the server's Retry-After)
+    MAX_ATTEMPTS = 3
+    RETRY_BACKOFF_MIN = 0.5
+    RETRY_BACKOFF_MAX = 8.0
+
+    # Refreshed tokens are reused until this many seconds before they expire
+    TOKEN_REFRESH_MARGIN = 60
+
+    # Static header templates merged with the per-call Authorization header
+    _JSON_ACCEPT = {"Accept": "application/json"}
+    _XML_ACCEPT = {"Accept": "application/xml"}
+
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+        self._oauth_client: Optional[httpx.AsyncClient] = None
+        # (kind, token digest) -> (expires_at, etag, payload); stale entries are
+        # kept (up to CACHE_RETENTION) so their ETag can be revalidated with
+        # If-None-Match
+        self._cache: TTLCache = TTLCache(maxsize=1024, ttl=self.CACHE_RETENTION)
+        self._cache_locks: "weakref.WeakValueDictionary[Tuple, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        # refresh token digest -> in-flight refresh shared by concurrent callers
+        self._refresh_inflight: Dict[bytes, "asyncio.Task[Dict]"] = {}
+        # refresh token digest -> (token response, expires_at monotonic)
+        self._refresh_cache: TTLCache = TTLCache(maxsize=1024, ttl=600)
+        # (token digest, table, key) -> (status, error message) of a 404, so
+        # repeat lookups of a missing row fail without a round-trip
+        self._missing_rows: TTLCache = TTLCache(maxsize=10_000, ttl=self.MISSING_ROW_TTL)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client for api.laserfiche.com, created on first use.
+
+        Reusing one client keeps TLS connections to Laserfiche alive across
+        requests instead of re-handshaking on every call. Relative URLs
+        resolve against API_BASE (the OData Table API). Pool size comes from
+        LASERFICHE_MAX_CONNECTIONS / LASERFICHE_MAX_KEEPALIVE.
+        """
+        if self._client is None or self._client.is_closed:
+            settings = get_settings()
+            self._client = httpx.AsyncClient(
+                base_url=self.API_BASE,
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=settings.LASERFICHE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LASERFICHE_MAX_KEEPALIVE,
+                    keepalive_expiry=30.0,
+                ),
+            )
+        return self._client
+
+    @property
+    def oauth_client(self) -> httpx.AsyncClient:
+        """Small pooled client for the OAuth token endpoint (rarely called)."""
+        if self._oauth_client is None or self._oauth_client.is_closed:
+            self._oauth_client = httpx.AsyncClient(
+                base_url=self.OAUTH_BASE,
+                http2=True,
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=4, max_connections=10),
+            )
+        return self._oauth_client
+
+    @cached_property
+    def _token_headers(self) -> Dict[str, str]:
+        """Token endpoint headers with Basic client credentials (built once; do not mutate)."""
+        settings = get_settings()
+        credentials = f"{settings.LASERFICHE_CLIENT_ID}:{settings.LASERFICHE_CLIENT_SECRET}"
+        b64_credentials = base64.b64encode(credentials.encode()).decode()
+        return {
+            "Authorization": f"Basic {b64_credentials}",
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+
+    @classmethod
+    def _bearer_headers(cls, access_token: str, accept: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Build per-request API headers (a fresh dict, safe to extend).
+
+        Args:
+            access_token: Laserfiche OAuth access token
+            accept: Accept header template (defaults to _JSON_ACCEPT)
+
+        Returns:
+            Headers with Accept and Bearer Authorization
+        """
+        return {**(accept or cls._JSON_ACCEPT), "Authorization": f"Bearer {access_token}"}
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _table_path(table_name: str) -> str:
+        """URL path of a table's entity set, with the name percent-encoded."""
+        return f"/table/{quote(table_name, safe='')}"
+
+    @classmethod
+    def _row_path(cls, table_name: str, key: str) -> str:
+        """URL path of one row; the key is an escaped OData string literal."""
+        literal = quote(key.replace("'", "''"), safe="")
+        return f"{cls._table_path(table_name)}('{literal}')"
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP clients (called on application shutdown)."""
+        for client in (self._client, self._oauth_client):
+            if client is not None:
+                await client.aclose()
+        self._client = None
+        self._oauth_client = None
+        self._cache.clear()
+        self._refresh_cache.clear()
+        self._missing_rows.clear()
+
+    async def __aenter__(self) -> "LaserficheClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def warmup(self) -> None:
+        """Open a pooled connection to the OData API ahead of the first request.
+
+        The request is unauthenticated, so the 401 is expected and ignored;
+        only the TCP/TLS session left in the pool matters. It bypasses the
+        retrying _request path, and failures are swallowed so an unreachable
+        Laserfiche never blocks startup.
+        """
+        try:
+            await self.client.get("/table", timeout=5.0)
+        except httpx.HTTPError:
+            pass
+
+    @cached_property
+    def _limiter(self) -> AdaptiveLimiter:
+        """Admission control for OData API requests (up to LASERFICHE_MAX_CONCURRENCY)."""
+        return AdaptiveLimiter(
+            get_settings().LASERFICHE_MAX_CONCURRENCY, max_pause=self.RETRY_BACKOFF_MAX
+        )
+
+    @cached_property
+    def _pacer(self) -> Optional[RequestPacer]:
+        """Request-rate pacing at LASERFICHE_RATE_LIMIT_RPS (None when disabled)."""
+        rate = get_settings().LASERFICHE_RATE_LIMIT_RPS
+        return RequestPacer(rate) if rate > 0 else None
+
+    async def _request(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request through the shared adaptive concurrency limit.
+
+        Bounding in-flight requests keeps bursts from exhausting the pool,
+        and backing off on throttling responses keeps throughput near
+        Laserfiche's actual limit instead of failing in bursts. GET requests
+        are retried up to MAX_ATTEMPTS times on transport errors and
+        transient statuses (RETRY_STATUS_CODES); each attempt takes its own
+        slot, and the backoff wait holds none. When LASERFICHE_RATE_LIMIT_RPS
+        is set, each attempt is also paced to that rate before taking a slot.
+        Pacing and the limiter apply to the OData client only; OAuth calls go
+        to a different service, so one user's API throttling never delays
+        another user's sign-in.
+
+        Args:
+            client: Client to send with (client or oauth_client)
+            method: HTTP method
+            url: URL, relative to the client's base_url or absolute
+            **kwargs: Passed to httpx.AsyncClient.request
+
+        Returns:
+            The final response (status is not checked)
+
+        Raises:
+            httpx.TransportError: If the last attempt fails to connect/transfer
+        """
+        retryable = method in ("GET", "HEAD")
+        limited = client is self._client
+        first_started_at: Optional[float] = None
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            last_attempt = not retryable or attempt == self.MAX_ATTEMPTS
+
+            if limited:
+                if self._pacer is not None:
+                    await self._pacer.wait()
+                started_at = await self._limiter.acquire()
+                if first_started_at is None:
+                    first_started_at = started_at
+            response: Optional[httpx.Response] = None
+            transport_error = False
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                transport_error = True
+                if last_attempt:
+                    raise
+            finally:
+                if first_started_at is not None:
+                    await self._limiter.release(first_started_at, response, transport_error)
+
+            if response is not None:
+                if last_attempt or response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                delay = retry_after_seconds(response)
+            else:
+                delay = None
+
+            if delay is None:
+                ceiling = min(self.RETRY_BACKOFF_MAX, self.RETRY_BACKOFF_MIN * 2 ** attempt)
+                delay = random.uniform(self.RETRY_BACKOFF_MIN, ceiling)
+            await asyncio.sleep(min(delay, self.RETRY_BACKOFF_MAX))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    @staticmethod
+    def _token_key(access_token: str) -> bytes:
+        """Digest of an access token, used to key per-user caches."""
+        return hashlib.blake2b(access_token.encode(), digest_size=16).digest()
+
+    async def _cached_get(
+        self,
+        cache_key: Tuple,
+        url: str,
+        headers: Dict[str, str],
+        parse: Callable[[httpx.Response], Any],
+        timeout: httpx.Timeout,
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """GET a rarely-changing resource through a TTL cache with ETag revalidation.
+
+        Fresh entries are returned without a request. Stale entries are
+        revalidated with If-None-Match so a 304 skips the body download.
+        Concurrent misses for the same key share a single upstream request.
+        A server Cache-Control max-age shorter than ttl wins, no-store
+        responses are not cached at all, and a 401 drops the entry.
+
+        Args:
+            cache_key: Cache key (should include the caller's token digest)
+            url: URL to fetch
+            headers: Request headers
+            parse: Turns a 200 response into the cached payload
+            timeout: Timeout for the upstream request
+            ttl: Seconds the entry stays fresh (default: METADATA_CACHE_TTL)
+
+        Returns:
+            Cached or freshly parsed payload (shared; do not mutate)
+
+        Raises:
+            httpx.HTTPError: If request fails
+        """
+        entry = self._cache.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[2]
+
+        lock = self._cache_locks.get(cache_key)
+        if lock is None:
+            lock = self._cache_locks[cache_key] = asyncio.Lock()
+
+        async with lock:
+            # Another request may have refreshed the entry while we waited
+            entry = self._cache.get(cache_key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[2]
+
+            request_headers = dict(headers)
+            if entry is not None and entry[1]:
+                request_headers["If-None-Match"] = entry[1]
+
+            response = await self._request(
+                self.client, "GET", url, headers=request_headers, timeout=timeout
+            )
+            if response.status_code == 304 and entry is not None:
+                etag, payload = entry[1], entry[2]
+            else:
+                if response.status_code == 401:
+                    self._cache.pop(cache_key, None)
+                response.raise_for_status()
+                etag, payload = response.headers.get("ETag"), parse(response)
+
+            if self._no_store(response):
+                # Nothing may be kept, not even for revalidation
+                self._cache.pop(cache_key, None)
+                return payload
+
+            fresh_for = self.METADATA_CACHE_TTL if ttl is None else ttl
+            server_max_age = self._max_age(response)
+            if server_max_age is not None:
+                fresh_for = min(fresh_for, server_max_age)
+
+            self._cache[cache_key] = (time.monotonic() + fresh_for, etag, payload)
+            return payload
+
+    @staticmethod
+    def _max_age(response: httpx.Response) -> Optional[float]:
+        """Freshness allowed by Cache-Control in seconds (None if unspecified).
+
+        no-cache yields 0: the entry is kept only to revalidate.
+        """
+        for directive in response.headers.get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            name = name.lower()
+            if name == "no-cache":
+                return 0.0
+            if name == "max-age":
+                try:
+                    return max(0.0, float(value.strip('"')))
+                except ValueError:
+                    return None
+        return None
+
+    @staticmethod
+    def _no_store(response: httpx.Response) -> bool:
+        """Whether Cache-Control forbids storing the response."""
+        return any(
+            directive.strip().lower() == "no-store"
+            for directive in response.headers.get("Cache-Control", "").split(",")
+        )
+
     def get_authorization_url(self, state: str, scopes: List[str]) -> str:
         """Build OAuth authorization URL for user redirect.
 
@@ -23,6 +485,7 @@ class LaserficheClient:
         Returns:
             Full authorization URL
         """
+        settings = get_settings()
         scope_str = " ".join(scopes)
         params = {
             "client_id": settings.LASERFICHE_CLIENT_ID,
@@ -32,9 +495,8 @@ class LaserficheClient:
             "state": state,
         }
 
-        # Build query string
-        query = "&".join([f"{k}={v}" for k, v in params.items()])
-        return f"{self.OAUTH_BASE}/Authorize?{query}"
+        # Percent-encode values (redirect URI, scopes) into the query string
+        return f"{self.OAUTH_BASE}/Authorize?{urlencode(params, quote_via=quote)}"
 
     async def exchange_code_for_token(self, code: str) -> Dict:
         """Exchange authorization code for access and refresh tokens.
@@ -48,63 +510,76 @@ class LaserficheClient:
         Raises:
             httpx.HTTPError: If token exchange fails
         """
-        # Create Basic auth header with client_id:client_secret
-        credentials = f"{settings.LASERFICHE_CLIENT_ID}:{settings.LASERFICHE_CLIENT_SECRET}"
-        b64_credentials = base64.b64encode(credentials.encode()).decode()
-
-        headers = {
-            "Authorization": f"Basic {b64_credentials}",
-            "Content-Type": "application/x-www-form-urlencoded",
-        }
-
         data = {
             "grant_type": "authorization_code",
             "code": code,
-            "redirect_uri": settings.LASERFICHE_REDIRECT_URI,
+            "redirect_uri": get_settings().LASERFICHE_REDIRECT_URI,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.OAUTH_BASE}/Token",
-                headers=headers,
-                data=data,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._request(
+            self.oauth_client,
+            "POST",
+            "/Token",
+            headers=self._token_headers,
+            data=data,
+            timeout=HTTP_TIMEOUTS["oauth_token"],
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def refresh_access_token(self, refresh_token: str) -> Dict:
         """Refresh an expired access token using refresh token.
 
+        The response is cached until shortly before the new access token
+        expires, and concurrent calls with the same refresh token share one
+        request to the token endpoint instead of each hitting Laserfiche.
+
         Args:
             refresh_token: Valid refresh token
 
         Returns:
-            New token response dict
+            New token response dict (shared between coalesced callers; do not mutate)
 
         Raises:
             httpx.HTTPError: If token refresh fails
         """
-        credentials = f"{settings.LASERFICHE_CLIENT_ID}:{settings.LASERFICHE_CLIENT_SECRET}"
-        b64_credentials = base64.b64encode(credentials.encode()).decode()
-
-        headers = {
-            "Authorization": f"Basic {b64_credentials}",
-            "Content-Type": "application/x-www-form-urlencoded",
-        }
-
+        key = self._token_key(refresh_token)
+        cached = self._refresh_cache.get(key)
+        if cached is not None and time.monotonic() < cached[1] - self.TOKEN_REFRESH_MARGIN:
+            return cached[0]
+
+        task = self._refresh_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request_token_refresh(refresh_token))
+            self._refresh_inflight[key] = task
+            task.add_done_callback(lambda _: self._refresh_inflight.pop(key, None))
+        # Shield so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _request_token_refresh(self, refresh_token: str) -> Dict:
+        """POST a refresh_token grant to the token endpoint."""
         data = {
             "grant_type": "refresh_token",
             "refresh_token": refresh_token,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.OAUTH_BASE}/Token",
-                headers=headers,
-                data=data,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._request(
+            self.oauth_client,
+            "POST",
+            "/Token",
+            headers=self._token_headers,
+            data=data,
+            timeout=HTTP_TIMEOUTS["oauth_token"],
+        )
+        response.raise_for_status()
+        token_response = orjson.loads(response.content)
+
+        expires_in = token_response.get("expires_in", 3600)
+        self._refresh_cache[self._token_key(refresh_token)] = (
+            token_response,
+            time.monotonic() + expires_in,
+        )
+        return token_response
 
     async def get_user_info(self, access_token: str) -> Optional[Dict]:
         """Get user information from Laserfiche (if endpoint available).
@@ -131,29 +606,56 @@ class LaserficheClient:
             access_token: Valid access token
 
         Returns:
-            List of repository dictionaries
+            List of repository dictionaries (cached briefly; do not mutate)
 
         Raises:
             httpx.HTTPError: If request fails
         """
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.API_BASE_V2}/Repositories",
-                headers=headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("value", [])
+        return await self._cached_get(
+            ("repositories", self._token_key(access_token)),
+            f"{self.API_BASE_V2}/Repositories",
+            self._bearer_headers(access_token),
+            lambda response: orjson.loads(response.content).get("value", []),
+            HTTP_TIMEOUTS["get_repositories"],
+        )
 
     # ========== Table API Methods ==========
 
+    @staticmethod
+    def _odata_count(data: Dict[str, Any]) -> Optional[int]:
+        """Table total from ``@odata.count`` of a $count=true query (None if absent)."""
+        count = data.get("@odata.count")
+        if count is None:
+            return None
+        try:
+            return int(count)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def _result_count(cls, response: httpx.Response, data: Dict[str, Any]) -> int:
+        """Total row count of a $count=true query (-1 if the server sent none).
+
+        Prefers ``@odata.count`` from the parsed body and falls back to the
+        X-APIServer-ResultCount header.
+        """
+        count = cls._odata_count(data)
+        if count is not None:
+            return count
+        result_count = response.headers.get("X-APIServer-ResultCount")
+        if result_count:
+            try:
+                return int(result_count)
+            except ValueError:
+                pass
+        return -1
+
     async def get_table_row_count(self, access_token: str, table_name: str) -> int:
-        """Get the row count for a table using OData aggregate.
+        """Get the row count for a table.
+
+        Requests zero rows with $count=true and uses ``@odata.count`` when the
+        server returns it, otherwise an OData aggregate. X-APIServer-ResultCount
+        is not used: it counts the rows in the response, which is 0 here.
 
         Args:
             access_token: Valid access token with project scope
@@ -165,28 +667,40 @@ class LaserficheClient:
         Raises:
             httpx.HTTPError: If request fails
         """
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
+        headers = self._bearer_headers(access_token)
+
+        response = await self._request(
+            self.client,
+            "GET",
+            self._table_path(table_name),
+            headers=headers,
+            params={"$top": 0, "$count": "true"},
+            timeout=HTTP_TIMEOUTS["get_table_row_count"],
+        )
+        response.raise_for_status()
+        total = self._odata_count(orjson.loads(response.content))
+        if total is not None:
+            return total
 
         params = {
             "$apply": "aggregate($count as rowCount)",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.API_BASE}/table/{table_name}",
-                headers=headers,
-                params=params,
-            )
-            response.raise_for_status()
-            data = response.json()
-            # Response format: { "value": [{ "rowCount": 123 }] }
-            value = data.get("value", [])
-            if value and len(value) > 0:
-                return value[0].get("rowCount", 0)
-            return 0
+        response = await self._request(
+            self.client,
+            "GET",
+            self._table_path(table_name),
+            headers=headers,
+            params=params,
+            timeout=HTTP_TIMEOUTS["get_table_row_count"],
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+        # Response format: { "value": [{ "rowCount": 123 }] }
+        value = data.get("value", [])
+        if value and len(value) > 0:
+            return value[0].get("rowCount", 0)
+        return 0
 
     async def list_tables(self, access_token: str) -> List[Dict]:
         """List all accessible tables using OData Table API.
@@ -195,28 +709,54 @@ class LaserficheClient:
             access_token: Valid access token with project scope
 
         Returns:
-            List of table dictionaries with name and metadata
+            List of table dictionaries with name and metadata (cached for
+            METADATA_CACHE_TTL seconds per token; do not mutate)
 
         Raises:
             httpx.HTTPError: If request fails
         """
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.API_BASE}/table",
-                headers=headers,
-            )
-            response.raise_for_status()
-            data = response.json()
-            # OData returns data in "value" array
-            return data.get("value", [])
+        headers = self._bearer_headers(access_token)
+
+        # OData returns data in "value" array
+        return await self._cached_get(
+            ("tables", self._token_key(access_token)),
+            "/table",
+            headers,
+            lambda response: orjson.loads(response.content).get("value", []),
+            HTTP_TIMEOUTS["list_tables"],
+        )
+
+    # $filter clause templates: case-insensitive wraps both sides in toupper(),
+    # case-sensitive is a plain comparison the server can serve from an index
+    _FILTER_TEMPLATE_CI = "toupper({col}) eq toupper('{val}')"
+    _FILTER_TEMPLATE_CS = "{col} eq '{val}'"
+    _FILTER_JOINERS = {"and": " and ", "or": " or "}
+    _QUOTE_ESCAPE = str.maketrans({"'": "''"})
+
+    # EDM types inferred from decoded JSON values (anything else is a string)
+    _INFERRED_TYPES = {bool: "Edm.Boolean", int: "Edm.Int32", float: "Edm.Double"}
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _filter_shape(
+        cls, columns: Tuple[str, ...], filter_mode: str, case_insensitive: bool
+    ) -> str:
+        """Compile the $filter for one column set into a template with a {} per value.
+
+        Repeated filters over the same columns (the common case for a given
+        table view) then cost one str.format instead of a template per column.
+        """
+        template = cls._FILTER_TEMPLATE_CI if case_insensitive else cls._FILTER_TEMPLATE_CS
+        return cls._FILTER_JOINERS[filter_mode].join(
+            template.format(col=column.replace("{", "{{").replace("}", "}}"), val="{}")
+            for column in columns
+        )
 
     def _build_odata_filter(
-        self, filters: Dict[str, str], filter_mode: str = "and"
+        self,
+        filters: Dict[str, str],
+        filter_mode: str = "and",
+        case_insensitive: bool = True,
     ) -> Optional[str]:
         """Build OData $filter string from column filters.
 
@@ -227,11 +767,12 @@ class LaserficheClient:
         - Literal: null
 
         NOTE: contains, startswith, endswith are NOT supported by Laserfiche.
-        This filter only supports exact match (case-insensitive).
+        This filter only supports exact match (case-insensitive by default).
 
         Args:
             filters: Dict of column names to filter values
             filter_mode: 'and' (all must match) or 'or' (any must match)
+            case_insensitive: Wrap comparisons in toupper() (slower server-side)
 
         Returns:
             OData $filter string or None if no filters
@@ -239,35 +780,20 @@ class LaserficheClient:
         if not filters:
             return None
 
-        filter_parts = []
-        for column, value in filters.items():
-            if not value:
-                continue
-
-            # Skip _key column in filters
-            if column == "_key":
-                continue
-
-            # Strip wildcards - Laserfiche doesn't support contains/startswith/endswith
-            # Just do exact match (case-insensitive)
-            clean_value = value.strip("*").strip()
-            if not clean_value:
-                continue
-
-            # Escape single quotes in value
-            escaped_value = clean_value.replace("'", "''")
-
-            # Case-insensitive exact match using toupper
-            filter_parts.append(
-                f"toupper({column}) eq toupper('{escaped_value}')"
-            )
-
-        if not filter_parts:
+        # Strip wildcards - Laserfiche doesn't support contains/startswith/endswith
+        # Just do exact match; skip empty values and the _key column
+        clean_filters = {
+            column: clean_value
+            for column, value in filters.items()
+            if value and column != "_key" and (clean_value := value.strip("*").strip())
+        }
+        if not clean_filters:
             return None
 
-        # Join with 'and' or 'or' based on filter_mode
-        joiner = f" {filter_mode} "
-        return joiner.join(filter_parts)
+        # Fill the compiled shape (joined with 'and' or 'or' based on
+        # filter_mode) with the quote-escaped values
+        shape = self._filter_shape(tuple(clean_filters), filter_mode, case_insensitive)
+        return shape.format(*(value.translate(self._QUOTE_ESCAPE) for value in clean_filters.values()))
 
     async def get_table_rows(
         self,
@@ -277,9 +803,18 @@ class LaserficheClient:
         offset: int = 0,
         filters: Optional[Dict[str, str]] = None,
         filter_mode: str = "and",
+        case_insensitive: bool = True,
+        columns: Optional[List[str]] = None,
+        after_key: Optional[str] = None,
     ) -> Dict:
         """Get rows from a table with pagination and filtering using OData Table API.
 
+        Offset pagination ($skip) makes the server scan and discard every
+        skipped row, so deep pages get slower. Passing after_key switches to
+        keyset pagination: rows with _key greater than after_key, which costs
+        the same at any depth. Both modes order rows by _key, so the
+        next_after_key of an offset page can continue in keyset mode.
+
         Args:
             access_token: Valid access token with project scope
             table_name: Name of the table
@@ -287,54 +822,275 @@ class LaserficheClient:
             offset: Number of rows to skip (default: 0)
             filters: Optional dict of column names to filter values (exact match)
             filter_mode: 'and' (all must match) or 'or' (any must match)
+            case_insensitive: Match filter values case-insensitively (default: True)
+            columns: Optional columns to return via $select (_key is always included)
+            after_key: Return rows after this _key (keyset pagination; offset is ignored)
 
         Returns:
-            Dict with rows, total count, limit, and offset
+            Dict with rows, total count, limit, offset and next_after_key (the
+            last row's _key when the page of min(limit, MAX_PAGE_SIZE) rows
+            came back full, else None). With after_key, total counts only the
+            rows after it.
 
         Raises:
             httpx.HTTPError: If request fails
         """
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
+        result, _ = await self._rows_page(
+            access_token,
+            table_name,
+            limit=limit,
+            offset=offset,
+            filters=filters,
+            filter_mode=filter_mode,
+            case_insensitive=case_insensitive,
+            columns=columns,
+            after_key=after_key,
+        )
+        return result
+
+    def _rows_query(
+        self,
+        access_token: str,
+        page_size: int,
+        filters: Optional[Dict[str, str]],
+        filter_mode: str,
+        case_insensitive: bool,
+        columns: Optional[List[str]],
+        after_key: Optional[str],
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Build the headers and query for a page of rows in _key order.
 
-        params: Dict[str, any] = {
-            "$top": min(limit, 1000),  # Cap at 1000
-            "$skip": offset,
+        Returns:
+            Tuple of (headers, params); callers add $count / $skip as needed
+        """
+        headers = self._bearer_headers(access_token)
+        # Let the server page with its own cursor; $top still bounds the
+        # response if the preference is not honored
+        headers["Prefer"] = f"odata.maxpagesize={page_size}"
+
+        params: Dict[str, Any] = {
+            "$top": page_size,
+            # Order every page by _key so next_after_key is a valid cursor
+            # whichever mode produced it
+            "$orderby": "_key asc",
         }
 
         # Add filter if provided
-        odata_filter = self._build_odata_filter(filters, filter_mode)
+        odata_filter = self._build_odata_filter(filters, filter_mode, case_insensitive)
+
+        if after_key is not None:
+            # Keyset pagination: seek past after_key instead of skipping rows
+            key_filter = "_key gt '{}'".format(after_key.replace("'", "''"))
+            odata_filter = f"{key_filter} and ({odata_filter})" if odata_filter else key_filter
+
         if odata_filter:
             params["$filter"] = odata_filter
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.API_BASE}/table/{table_name}",
+        # Project to the requested columns so unused ones are not transferred
+        if columns:
+            params["$select"] = ",".join(dict.fromkeys(["_key", *columns]))
+
+        return headers, params
+
+    async def iter_table_rows(
+        self,
+        access_token: str,
+        table_name: str,
+        page_size: int = MAX_PAGE_SIZE,
+        filters: Optional[Dict[str, str]] = None,
+        filter_mode: str = "and",
+        case_insensitive: bool = True,
+        columns: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict]:
+        """Yield every matching row of a table, one full page per request.
+
+        For exports and preloads, where request count dominates: each
+        round-trip pays auth, query planning and latency, so bulk reads use
+        the largest page Laserfiche serves (MAX_PAGE_SIZE; larger sizes are
+        clamped). Pages are read in _key order, following @odata.nextLink
+        when the server sends one and seeking past the last _key otherwise,
+        until a page comes back empty or short without a nextLink.
+
+        Args:
+            access_token: Valid access token with project scope
+            table_name: Name of the table
+            page_size: Rows per request (default and max: MAX_PAGE_SIZE)
+            filters: Optional dict of column names to filter values (exact match)
+            filter_mode: 'and' (all must match) or 'or' (any must match)
+            case_insensitive: Match filter values case-insensitively (default: True)
+            columns: Optional columns to return via $select (_key is always included)
+
+        Yields:
+            Row dicts in _key order
+
+        Raises:
+            httpx.HTTPError: If a page request fails
+        """
+        page_size = max(1, min(page_size, self.MAX_PAGE_SIZE))
+        query = (filters, filter_mode, case_insensitive, columns)
+        headers, params = self._rows_query(access_token, page_size, *query, None)
+        url = self._table_path(table_name)
+        request_params: Optional[Dict[str, Any]] = params
+
+        while True:
+            response = await self._request(
+                self.client,
+                "GET",
+                url,
                 headers=headers,
-                params=params,
+                params=request_params,
+                timeout=HTTP_TIMEOUTS["get_table_rows"],
             )
             response.raise_for_status()
-            data = response.json()
-
+            data = orjson.loads(response.content)
             rows = data.get("value", [])
+            for row in rows:
+                yield row
+            if not rows:
+                return
 
-            # Try to get total count from X-APIServer-ResultCount header
-            total = -1
-            result_count = response.headers.get("X-APIServer-ResultCount")
-            if result_count:
-                try:
-                    total = int(result_count)
-                except ValueError:
-                    pass
+            # The nextLink carries the full query; only follow it to the
+            # Table API so the bearer token is never sent elsewhere
+            next_link = data.get("@odata.nextLink")
+            if isinstance(next_link, str) and next_link.startswith(f"{self.API_BASE}/"):
+                url, request_params = next_link, None
+                continue
+            if not next_link and len(rows) < page_size:
+                return
 
-            return {
-                "rows": rows,
-                "total": total,
-                "limit": limit,
-                "offset": offset,
-            }
+            url = self._table_path(table_name)
+            _, request_params = self._rows_query(
+                access_token, page_size, *query, rows[-1]["_key"]
+            )
+
+    async def _rows_page(
+        self,
+        access_token: str,
+        table_name: str,
+        limit: int = 50,
+        offset: int = 0,
+        filters: Optional[Dict[str, str]] = None,
+        filter_mode: str = "and",
+        case_insensitive: bool = True,
+        columns: Optional[List[str]] = None,
+        after_key: Optional[str] = None,
+    ) -> Tuple[Dict, Optional[int]]:
+        """Fetch a page for get_table_rows, also returning ``@odata.count``.
+
+        get_table_view reuses the page's total only when it is the table
+        total the server reported (a count header may just be the page size).
+
+        Returns:
+            Tuple of (get_table_rows result, @odata.count or None)
+
+        Raises:
+            httpx.HTTPError: If request fails
+        """
+        page_size = min(limit, self.MAX_PAGE_SIZE)
+        headers, params = self._rows_query(
+            access_token, page_size, filters, filter_mode, case_insensitive, columns, after_key
+        )
+        # Return the total with the page so no separate count request is needed
+        params["$count"] = "true"
+        if after_key is None:
+            params["$skip"] = offset
+
+        response = await self._request(
+            self.client,
+            "GET",
+            self._table_path(table_name),
+            headers=headers,
+            params=params,
+            timeout=HTTP_TIMEOUTS["get_table_rows"],
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        rows = data.get("value", [])
+
+        result = {
+            "rows": rows,
+            # Total from @odata.count / X-APIServer-ResultCount (-1 if absent)
+            "total": self._result_count(response, data),
+            "limit": limit,
+            "offset": offset,
+            # A full page (as actually requested) may have more rows after it
+            "next_after_key": rows[-1].get("_key") if rows and len(rows) >= page_size else None,
+        }
+        return result, self._odata_count(data)
+
+    async def get_table_view(
+        self,
+        access_token: str,
+        table_name: str,
+        limit: int = 50,
+        offset: int = 0,
+        filters: Optional[Dict[str, str]] = None,
+        filter_mode: str = "and",
+        case_insensitive: bool = True,
+        columns: Optional[List[str]] = None,
+        after_key: Optional[str] = None,
+    ) -> Dict:
+        """Get the first page of rows, the schema and the row count together.
+
+        Rows and schema are fetched concurrently. The row count is taken from
+        the rows response's @odata.count when unfiltered, so a separate count
+        request is only made when filters apply or the server sent no
+        @odata.count. Schema and count are best-effort.
+
+        Args:
+            access_token: Valid access token with project scope
+            table_name: Name of the table
+            limit: Number of rows to return (default: 50, max: 1000)
+            offset: Number of rows to skip (default: 0)
+            filters: Optional dict of column names to filter values (exact match)
+            filter_mode: 'and' (all must match) or 'or' (any must match)
+            case_insensitive: Match filter values case-insensitively (default: True)
+            columns: Optional columns to return via $select (_key is always included)
+            after_key: Return rows after this _key (keyset pagination; offset is ignored)
+
+        Returns:
+            Dict with table_name, rows (as from get_table_rows), columns and
+            row_count (columns/row_count are None if their request failed)
+
+        Raises:
+            httpx.HTTPError: If the rows request fails
+        """
+        page, schema = await asyncio.gather(
+            self._rows_page(
+                access_token,
+                table_name,
+                limit=limit,
+                offset=offset,
+                filters=filters,
+                filter_mode=filter_mode,
+                case_insensitive=case_insensitive,
+                columns=columns,
+                after_key=after_key,
+            ),
+            self.get_table_schema(access_token, table_name),
+            return_exceptions=True,
+        )
+        if isinstance(page, BaseException):
+            raise page
+        rows, odata_count = page
+
+        # An unfiltered page's @odata.count is the table's total row count
+        unfiltered = after_key is None and not self._build_odata_filter(filters, filter_mode)
+        if odata_count is not None and unfiltered:
+            row_count: Optional[int] = odata_count
+        else:
+            try:
+                row_count = await self.get_table_row_count(access_token, table_name)
+            except httpx.HTTPError:
+                row_count = None
+
+        return {
+            "table_name": table_name,
+            "rows": rows,
+            "columns": None if isinstance(schema, BaseException) else schema,
+            "row_count": row_count,
+        }
 
     async def get_table_row(
         self,
@@ -344,6 +1100,9 @@ class LaserficheClient:
     ) -> Dict:
         """Get a single row from a table by key using OData Table API.
 
+        A 404 is remembered for MISSING_ROW_TTL seconds, and repeat lookups
+        of that key raise it again without calling Laserfiche.
+
         Args:
             access_token: Valid access token with project scope
             table_name: Name of the table
@@ -355,18 +1114,99 @@ class LaserficheClient:
         Raises:
             httpx.HTTPError: If request fails or row not found (404)
         """
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/json",
-        }
+        missing_key = (self._token_key(access_token), table_name, key)
+        missing = self._missing_rows.get(missing_key)
+        if missing is not None:
+            raise self._missing_row_error(self._row_path(table_name, key), *missing)
+
+        headers = self._bearer_headers(access_token)
+
+        response = await self._request(
+            self.client,
+            "GET",
+            self._row_path(table_name, key),
+            headers=headers,
+            timeout=HTTP_TIMEOUTS["get_table_row"],
+        )
+        if response.status_code == 404:
+            self._missing_rows[missing_key] = (404, self._error_message(response))
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    @staticmethod
+    def _error_message(response: httpx.Response) -> Optional[str]:
+        """error.message from a Laserfiche JSON error body (None if absent)."""
+        try:
+            message = orjson.loads(response.content).get("error", {}).get("message")
+        except (orjson.JSONDecodeError, AttributeError):
+            return None
+        return message if isinstance(message, str) else None
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.API_BASE}/table/{table_name}('{key}')",
-                headers=headers,
+    @classmethod
+    def _missing_row_error(
+        cls, path: str, status_code: int, message: Optional[str]
+    ) -> httpx.HTTPStatusError:
+        """Rebuild a remembered row-lookup failure as a fresh HTTPStatusError.
+
+        The response is minimal (status plus the original error message) and
+        its request carries no headers, so no credentials are retained.
+        """
+        request = httpx.Request("GET", f"{cls.API_BASE}{path}")
+        if message is None:
+            response = httpx.Response(status_code, request=request)
+        else:
+            response = httpx.Response(
+                status_code, json={"error": {"message": message}}, request=request
             )
-            response.raise_for_status()
-            return response.json()
+        return httpx.HTTPStatusError(
+            f"Client error '{status_code} {response.reason_phrase}' for url '{request.url}' (cached)",
+            request=request,
+            response=response,
+        )
+
+    @staticmethod
+    def _metadata_columns(metadata: bytes) -> Dict[str, List[Dict]]:
+        """Parse the column definitions of every EntityType in $metadata.
+
+        One streaming pass that clears each EntityType once it is read, so
+        only the parsed columns outlive the call. Uses lxml's C iterparse
+        (filtered to EntityType tags) when installed, otherwise xml.etree.
+
+        Args:
+            metadata: Raw $metadata XML bytes
+
+        Returns:
+            Dict of lowercased entity name to column definitions
+        """
+        import io
+
+        entity_tag = f"{{{ODATA_NS['edm']}}}EntityType"
+
+        if lxml_etree is not None:
+            events = lxml_etree.iterparse(io.BytesIO(metadata), events=("end",), tag=entity_tag)
+        else:
+            import xml.etree.ElementTree as ET
+
+            events = ET.iterparse(io.BytesIO(metadata), events=("end",))
+
+        columns_by_table: Dict[str, List[Dict]] = {}
+        for _, elem in events:
+            if elem.tag != entity_tag:
+                continue
+            # The first EntityType with a (case-insensitive) name wins
+            columns_by_table.setdefault(
+                elem.get("Name", "").lower(),
+                [
+                    {
+                        "name": prop.get("Name", ""),
+                        "type": prop.get("Type", "Edm.String"),
+                        "required": prop.get("Nullable", "true").lower() != "true",
+                    }
+                    for prop in elem.findall("edm:Property", ODATA_NS)
+                ],
+            )
+            elem.clear()
+        return columns_by_table
 
     async def get_table_schema(
         self,
@@ -380,95 +1220,64 @@ class LaserficheClient:
             table_name: Name of the table
 
         Returns:
-            List of column definitions with name and type
+            List of column definitions with name and type (columns from
+            $metadata are cached for SCHEMA_CACHE_TTL seconds; do not mutate)
 
         Raises:
             httpx.HTTPError: If request fails
         """
-        import xml.etree.ElementTree as ET
         import logging
         logger = logging.getLogger(__name__)
 
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Accept": "application/xml",
-        }
-
-        async with httpx.AsyncClient() as client:
-            # Try to get schema from $metadata endpoint
-            try:
-                response = await client.get(
-                    f"{self.API_BASE}/table/$metadata",
-                    headers=headers,
-                )
-                response.raise_for_status()
-
-                # Parse XML metadata
-                root = ET.fromstring(response.text)
-                # OData metadata uses namespaces
-                ns = {
-                    "edmx": "http://docs.oasis-open.org/odata/ns/edmx",
-                    "edm": "http://docs.oasis-open.org/odata/ns/edm",
-                }
-
-                columns = []
-                # Find the EntityType for our table
-                for entity_type in root.findall(".//edm:EntityType", ns):
-                    entity_name = entity_type.get("Name", "")
-                    if entity_name.lower() == table_name.lower():
-                        for prop in entity_type.findall("edm:Property", ns):
-                            prop_name = prop.get("Name", "")
-                            prop_type = prop.get("Type", "Edm.String")
-                            nullable = prop.get("Nullable", "true").lower() == "true"
-
-                            columns.append({
-                                "name": prop_name,
-                                "type": prop_type,
-                                "required": not nullable,
-                            })
-                        break
-
-                if columns:
-                    logger.info(f"Got schema from $metadata for {table_name}: {len(columns)} columns")
-                    return columns
-
-            except Exception as e:
-                logger.warning(f"Failed to get $metadata for {table_name}: {e}, falling back to inference")
-
-            # Fallback: infer schema from first row
-            headers["Accept"] = "application/json"
-            response = await client.get(
-                f"{self.API_BASE}/table/{table_name}",
-                headers=headers,
-                params={"$top": 1},
+        headers = self._bearer_headers(access_token, self._XML_ACCEPT)
+
+        # Try to get schema from $metadata endpoint
+        try:
+            # Only the parsed columns of known entities are cached, not the
+            # document; unknown table names are looked up without adding entries
+            columns_by_table = await self._cached_get(
+                ("metadata", self._token_key(access_token)),
+                "/table/$metadata",
+                headers,
+                lambda response: self._metadata_columns(response.content),
+                HTTP_TIMEOUTS["get_table_schema"],
+                ttl=self.SCHEMA_CACHE_TTL,
             )
-            response.raise_for_status()
-            data = response.json()
 
-            rows = data.get("value", [])
-            if not rows:
-                return []
-
-            # Infer column types from first row
-            columns = []
-            for key, value in rows[0].items():
-                col_type = "Edm.String"
-                if isinstance(value, bool):
-                    col_type = "Edm.Boolean"
-                elif isinstance(value, int):
-                    col_type = "Edm.Int32"
-                elif isinstance(value, float):
-                    col_type = "Edm.Double"
-                elif value is None:
-                    col_type = "Edm.String"
-
-                columns.append({
-                    "name": key,
-                    "type": col_type,
-                    "required": key == "_key",  # Only _key is required (and auto-generated)
-                })
-
-            return columns
+            columns = columns_by_table.get(table_name.lower())
+            if columns:
+                logger.info("Got schema from $metadata for %s: %d columns", table_name, len(columns))
+                return columns
+
+        except Exception as e:
+            logger.warning("Failed to get $metadata for %s: %s, falling back to inference", table_name, e)
+
+        # Fallback: infer schema from first row
+        headers = self._bearer_headers(access_token)
+        response = await self._request(
+            self.client,
+            "GET",
+            self._table_path(table_name),
+            headers=headers,
+            params={"$top": 1},
+            timeout=HTTP_TIMEOUTS["get_table_schema"],
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content)
+
+        rows = data.get("value", [])
+        if not rows:
+            return []
+
+        # Infer column types from first row (exact JSON types, so bool is not int)
+        return [
+            {
+                "name": key,
+                "type": self._INFERRED_TYPES.get(type(value), "Edm.String"),
+                "required": key == "_key",  # Only _key is required (and auto-generated)
+            }
+            for key, value in rows[0].items()
+        ]
 
 
 # Global instance
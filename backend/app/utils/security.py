@@ -3,14 +3,8 @@
 import secrets
 import time
 import hmac
-import hashlib
 import base64
-from cryptography.fernet import Fernet
-from app.config import settings
-
-
-# Initialize Fernet cipher
-cipher = Fernet(settings.TOKEN_ENCRYPTION_KEY.encode())
+from app.config import get_settings
 
 
 def generate_state() -> str:
@@ -22,6 +16,22 @@ def generate_state() -> str:
     return secrets.token_urlsafe(32)
 
 
+# Leading byte of every signed state, so the format can change later without
+# misreading older cookies
+_STATE_VERSION = b"\x01"
+
+
+def _sign_state(message: bytes) -> bytes:
+    """Keyed BLAKE2b signature (raw 16 bytes) of a state message.
+
+    A native keyed hash needs no HMAC double pass; copying the pre-keyed
+    state from settings also skips the key setup on every call.
+    """
+    mac = get_settings().state_mac.copy()
+    mac.update(message)
+    return mac.digest()
+
+
 def create_signed_state(state: str, expires_in_seconds: int = 600) -> str:
     """Create a signed state value with expiry timestamp.
 
@@ -30,17 +40,13 @@ def create_signed_state(state: str, expires_in_seconds: int = 600) -> str:
         expires_in_seconds: How long until the state expires (default 10 minutes)
 
     Returns:
-        Signed state string: base64(state|expiry|signature)
+        Signed state string: base64(version + state|expiry|signature)
     """
     expiry = int(time.time()) + expires_in_seconds
-    message = f"{state}|{expiry}"
-    signature = hmac.new(
-        settings.SECRET_KEY.encode(),
-        message.encode(),
-        hashlib.sha256
-    ).hexdigest()
-    combined = f"{message}|{signature}"
-    return base64.urlsafe_b64encode(combined.encode()).decode()
+    message = f"{state}|{expiry}".encode()
+    # Raw signature bytes keep the cookie shorter than a hex digest
+    combined = _STATE_VERSION + message + b"|" + _sign_state(message)
+    return base64.urlsafe_b64encode(combined).decode()
 
 
 def verify_signed_state(signed_state: str) -> str:
@@ -56,34 +62,61 @@ def verify_signed_state(signed_state: str) -> str:
         ValueError: If signature invalid or expired
     """
     try:
-        decoded = base64.urlsafe_b64decode(signed_state.encode()).decode()
-        parts = decoded.split("|")
+        decoded = base64.urlsafe_b64decode(signed_state.encode())
+        if decoded[:1] != _STATE_VERSION:
+            raise ValueError("Unsupported state version")
+
+        # The raw signature may itself contain "|", so split the prefix only
+        parts = decoded[1:].split(b"|", 2)
         if len(parts) != 3:
             raise ValueError("Invalid state format")
 
-        state, expiry_str, signature = parts
-        expiry = int(expiry_str)
+        state, expiry_bytes, signature = parts
+        expiry = int(expiry_bytes)
 
         # Check expiry
         if time.time() > expiry:
             raise ValueError("State has expired")
 
         # Verify signature
-        message = f"{state}|{expiry_str}"
-        expected_signature = hmac.new(
-            settings.SECRET_KEY.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        message = b"|".join((state, expiry_bytes))
+        expected_signature = _sign_state(message)
 
         if not hmac.compare_digest(signature, expected_signature):
             raise ValueError("Invalid signature")
 
-        return state
+        return state.decode()
     except Exception as e:
         raise ValueError(f"Invalid signed state: {str(e)}")
 
 
+def encrypt_token_bytes(token: bytes) -> bytes:
+    """Encrypt raw token bytes using Fernet encryption.
+
+    Args:
+        token: Plain token bytes to encrypt
+
+    Returns:
+        Fernet token bytes (url-safe base64)
+    """
+    return get_settings().token_cipher.encrypt(token)
+
+
+def decrypt_token_bytes(encrypted_token: bytes) -> bytes:
+    """Decrypt Fernet token bytes.
+
+    Args:
+        encrypted_token: Fernet token bytes
+
+    Returns:
+        Decrypted token bytes
+
+    Raises:
+        cryptography.fernet.InvalidToken: If the token is invalid or tampered
+    """
+    return get_settings().token_cipher.decrypt(encrypted_token)
+
+
 def encrypt_token(token: str) -> str:
     """Encrypt a token using Fernet encryption.
 
@@ -95,7 +128,7 @@ def encrypt_token(token: str) -> str:
     """
     if not token:
         return ""
-    return cipher.encrypt(token.encode()).decode()
+    return encrypt_token_bytes(token.encode()).decode()
 
 
 def decrypt_token(encrypted_token: str) -> str:
@@ -109,4 +142,4 @@ def decrypt_token(encrypted_token: str) -> str:
     """
     if not encrypted_token:
         return ""
-    return cipher.decrypt(encrypted_token.encode()).decode()
+    return decrypt_token_bytes(encrypted_token.encode()).decode()